@@ -9,24 +9,32 @@ Requirements:
 import hashlib
 import re
 import string
+from functools import lru_cache
 
 import escapism
 
-_alphanum = tuple(string.ascii_letters + string.digits)
-_alpha_lower = tuple(string.ascii_lowercase)
-_alphanum_lower = tuple(string.ascii_lowercase + string.digits)
-_lower_plus_hyphen = _alphanum_lower + ('-',)
+_alpha_lower_set = frozenset(string.ascii_lowercase)
 
-# patterns _do not_ need to cover length or start/end conditions,
-# which are handled separately
-_object_pattern = re.compile(r'^[a-z0-9\-]+$')
-_label_pattern = re.compile(r'^[a-z0-9\.\-_]+$', flags=re.IGNORECASE)
+# patterns cover the full rules, including length and start/end conditions,
+# and must be used with fullmatch.
+# Character classes are spelled out rather than using re.IGNORECASE,
+# which would also accept non-ascii characters like '\u212a' (KELVIN SIGN).
+_object_pattern = re.compile(r'[a-z](?:[a-z0-9\-]{0,61}[a-z0-9])?')
+_label_pattern = re.compile(r'[a-zA-Z0-9](?:[a-zA-Z0-9\.\-_]{0,61}[a-zA-Z0-9])?')
 
 # match anything that's not lowercase alphanumeric (will be stripped, replaced with '-')
 _non_alphanum_pattern = re.compile(r'[^a-z0-9]+')
 
 # length of hash suffix
 _hash_length = 8
+# number of digest bytes needed for the hash suffix (two hex chars per byte)
+_hash_digest_size = _hash_length // 2
+
+# slugs are pure functions of their inputs and are recomputed
+# for the same users and servers on every spawn, so cache them.
+# Name components are cached separately, since the same username
+# appears in many multi_slug calls (one per named server).
+_slug_cache_size = 4096
 
 # Make sure username and servername match the restrictions for DNS labels
 # Note: '-' is not in safe_chars, as it is being used as escape character
@@ -42,26 +50,6 @@ def escape_slug(name):
     ).lower()
 
 
-def _is_valid_general(
-    s, starts_with=None, ends_with=None, pattern=None, min_length=None, max_length=None
-):
-    """General is_valid check
-
-    Checks rules:
-    """
-    if min_length and len(s) < min_length:
-        return False
-    if max_length and len(s) > max_length:
-        return False
-    if starts_with and not s.startswith(starts_with):
-        return False
-    if ends_with and not s.endswith(ends_with):
-        return False
-    if pattern and not pattern.match(s):
-        return False
-    return True
-
-
 def is_valid_object_name(s):
     """is_valid check for object names
 
@@ -73,14 +61,7 @@ def is_valid_object_name(s):
     - only lowercalse letters, numbers, '-'
     """
     # object rules: https://kubernetes.io/docs/concepts/overview/working-with-objects/names/#names
-    return _is_valid_general(
-        s,
-        starts_with=_alpha_lower,
-        ends_with=_alphanum_lower,
-        pattern=_object_pattern,
-        max_length=63,
-        min_length=1,
-    )
+    return _object_pattern.fullmatch(s) is not None
 
 
 def is_valid_label(s):
@@ -89,13 +70,7 @@ def is_valid_label(s):
     if not s:
         # empty strings are valid labels
         return True
-    return _is_valid_general(
-        s,
-        starts_with=_alphanum,
-        ends_with=_alphanum,
-        pattern=_label_pattern,
-        max_length=63,
-    )
+    return _label_pattern.fullmatch(s) is not None
 
 
 def is_valid_default(s):
@@ -110,6 +85,7 @@ def is_valid_default(s):
     return is_valid_object_name(s)
 
 
+@lru_cache(maxsize=_slug_cache_size)
 def _extract_safe_name(name, max_length):
     """Generate safe substring of a name
 
@@ -124,12 +100,15 @@ def _extract_safe_name(name, max_length):
     """
     # compute safe slug from name (don't worry about collisions, hash handles that)
     # cast to lowercase
+    safe_name = name.lower()
     # replace any sequence of non-alphanumeric characters with a single '-'
-    safe_name = _non_alphanum_pattern.sub("-", name.lower())
+    # skip the regex when there is nothing to replace (common for usernames)
+    if not (safe_name.isascii() and safe_name.isalnum()):
+        safe_name = _non_alphanum_pattern.sub("-", safe_name)
     # truncate to max_length chars, strip '-' off ends
     safe_name = safe_name.lstrip("-")[:max_length].rstrip("-")
     # ensure starts with lowercase letter
-    if safe_name and not safe_name.startswith(_alpha_lower):
+    if safe_name and safe_name[0] not in _alpha_lower_set:
         safe_name = "x-" + safe_name[: max_length - 2]
     if not safe_name:
         # make sure it's non-empty
@@ -137,6 +116,7 @@ def _extract_safe_name(name, max_length):
     return safe_name
 
 
+@lru_cache(maxsize=_slug_cache_size)
 def strip_and_hash(name, max_length=32):
     """Generate an always-safe, unique string for any input
 
@@ -147,7 +127,7 @@ def strip_and_hash(name, max_length=32):
     if name_length < 1:
         raise ValueError(f"Cannot make safe names shorter than {_hash_length + 4}")
     # quick, short hash to avoid name collisions
-    name_hash = hashlib.sha256(name.encode("utf8")).hexdigest()[:_hash_length]
+    name_hash = hashlib.sha256(name.encode("utf8")).digest()[:_hash_digest_size].hex()
     safe_name = _extract_safe_name(name, name_length)
     # due to stripping of '-' in _extract_safe_name,
     # the result will always have _exactly_ '---', never '--' nor '----'
@@ -155,6 +135,7 @@ def strip_and_hash(name, max_length=32):
     return f"{safe_name}---{name_hash}"
 
 
+@lru_cache(maxsize=_slug_cache_size)
 def safe_slug(name, is_valid=is_valid_default, max_length=None):
     """Always generate a safe slug
 
@@ -167,14 +148,15 @@ def safe_slug(name, is_valid=is_valid_default, max_length=None):
     1. validity, and
     2. no collisions
     """
-    if '--' in name:
+    if (
         # don't accept any names that could collide with the safe slug
-        return strip_and_hash(name, max_length=max_length or 32)
-    # allow max_length override for truncated sub-strings
-    if is_valid(name) and (max_length is None or len(name) <= max_length):
+        '--' not in name
+        # allow max_length override for truncated sub-strings
+        and (max_length is None or len(name) <= max_length)
+        and is_valid(name)
+    ):
         return name
-    else:
-        return strip_and_hash(name, max_length=max_length or 32)
+    return strip_and_hash(name, max_length=max_length or 32)
 
 
 def multi_slug(names, max_length=48):
@@ -187,16 +169,13 @@ def multi_slug(names, max_length=48):
 
     In order to avoid hash collisions on boundaries, use `\\xFF` as delimiter
     """
-    hasher = hashlib.sha256()
-    hasher.update(names[0].encode("utf8"))
-    for name in names[1:]:
-        # \xFF can't occur as a start byte in UTF8
-        # so use it as a word delimiter to make sure overlapping words don't collide
-        hasher.update(b"\xFF")
-        hasher.update(name.encode("utf8"))
-    hash = hasher.hexdigest()[:_hash_length]
+    # names may be any sequence, cache on a hashable tuple
+    return _multi_slug(tuple(names), max_length)
 
-    name_slugs = []
+
+@lru_cache(maxsize=_slug_cache_size)
+def _multi_slug(names, max_length):
+    """Cached implementation of multi_slug"""
     available_chars = max_length - (_hash_length + 1)
     # allocate equal space per name
     # per_name accounts for '{name}--', so really two less
@@ -204,8 +183,18 @@ def multi_slug(names, max_length=48):
     name_max_length = per_name - 2
     if name_max_length < 2:
         raise ValueError(f"Not enough characters for {len(names)} names: {max_length}")
-    for name in names:
+
+    # hash and slug each name in a single pass
+    hasher = hashlib.sha256()
+    name_slugs = []
+    for i, name in enumerate(names):
+        if i:
+            # \xFF can't occur as a start byte in UTF8
+            # so use it as a word delimiter to make sure overlapping words don't collide
+            hasher.update(b"\xFF")
+        hasher.update(name.encode("utf8"))
         name_slugs.append(_extract_safe_name(name, name_max_length))
+    hash = hasher.digest()[:_hash_digest_size].hex()
 
     # by joining names with '--', this cannot collide with single-hashed names,
     # which can only contain '-' and the '---' hash delimiter once
@@ -1,6 +1,11 @@
 import pytest
 
-from kubespawner.slugs import is_valid_label, safe_slug
+from kubespawner.slugs import (
+    is_valid_label,
+    is_valid_object_name,
+    multi_slug,
+    safe_slug,
+)
 
 
 @pytest.mark.parametrize(
@@ -72,3 +77,42 @@ def test_safe_slug_max_length(max_length, length, expected):
 def test_safe_slug_label(name, expected):
     slug = safe_slug(name, is_valid=is_valid_label)
     assert slug == expected
+
+
+@pytest.mark.parametrize(
+    "names, expected",
+    [
+        (["user", "server"], "user--server---ff173834"),
+        (("user", "server"), "user--server---ff173834"),
+        (["jupyter-Alex", "üni"], "jupyter-alex--ni---953a9593"),
+        (["x" * 40, "y" * 40], "xxxxxxxxxxxxxxxxx--yyyyyyyyyyyyyyyyy---e49401bc"),
+        (["a--b", ""], "a-b--x---350ebc85"),
+    ],
+)
+def test_multi_slug(names, expected):
+    slug = multi_slug(names)
+    assert slug == expected
+
+
+@pytest.mark.parametrize(
+    "s, object_name, label",
+    [
+        ("", False, True),
+        ("a", True, True),
+        ("a-b", True, True),
+        ("a-", False, False),
+        ("9a", False, True),
+        ("Ab", False, True),
+        ("a.b", False, True),
+        ("a_b", False, True),
+        ("a/b", False, False),
+        ("a\n", False, False),
+        # unicode case folding must not match ascii letters
+        ("a\u212ab", False, False),
+        pytest.param("x" * 63, True, True, id="x63"),
+        pytest.param("x" * 64, False, False, id="x64"),
+    ],
+)
+def test_is_valid(s, object_name, label):
+    assert is_valid_object_name(s) == object_name
+    assert is_valid_label(s) == label